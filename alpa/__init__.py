@@ -31,6 +31,7 @@ from alpa.device_mesh import (
     set_seed, get_global_num_devices)
 from alpa.global_env import global_config
 from alpa.mesh_profiling import ProfilingResultDatabase
+from alpa.model.model_util import DynamicScale
 from alpa.parallel_method import (ShardParallel, DataParallel, Zero2Parallel,
                                   Zero3Parallel, PipeshardParallel,
                                   CreateStateParallel, FollowParallel,
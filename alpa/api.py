@@ -12,6 +12,8 @@ from jax.tree_util import tree_flatten, tree_unflatten, PyTreeDef
 
 from alpa.device_mesh import init_global_cluster, shutdown_global_cluster
 from alpa.parallel_method import ParallelMethod, ShardParallel
+from alpa.pipeline_parallel.compile_executable import (
+    clear_pipeshard_compile_cache)
 from alpa.pipeline_parallel.primitive_def import mark_gradient
 from alpa.util import (auto_donate_argnums, auto_static_argnums,
                        abstractify_with_aval, GradFuncTransformContext)
@@ -236,6 +238,7 @@ def _compile_parallel_executable(
 def clear_executable_cache():
     """Clear all cached executables."""
     _compile_parallel_executable.cache_clear()
+    clear_pipeshard_compile_cache()
 
 
 def grad(*args, **kwargs):
@@ -142,6 +142,10 @@ class MeshHostWorker:
 
         self.buffers = {}  # Dict[uuid -> Sequence[DeviceArray]]
         self.executables = {}  # Dict[uud -> MeshWorkerExecutable]
+        # Dict[uuid -> int]. Pipeshard executables built from a cached
+        # PipeshardConfig share the stage executables below, so they are
+        # refcounted and only deleted when the last owner is deleted.
+        self.executable_ref_counts = {}
 
         self.send_tasks = {}  # Dict[uuid -> ReshardingSendTask]
         self.recv_tasks = {}  # Dict[uuid -> ReshardingRecvTask]
@@ -272,11 +276,18 @@ class MeshHostWorker:
     ##### Executable Related Functions #####
     def put_executable(self, uuid: int,
                        executable_class: "MeshWorkerExecutable", *args):
+        if uuid in self.executables:
+            self.executable_ref_counts[uuid] += 1
+            return
         self.executables[uuid] = executable_class(self, uuid, *args)
+        self.executable_ref_counts[uuid] = 1
 
     def delete_executable(self, uuid: int):
         if uuid in self.executables:
-            del self.executables[uuid]
+            self.executable_ref_counts[uuid] -= 1
+            if self.executable_ref_counts[uuid] == 0:
+                del self.executables[uuid]
+                del self.executable_ref_counts[uuid]
 
     def run_executable(self, uuid: int, *args, **kwargs):
         self.executables[uuid].execute_on_worker(*args, **kwargs)
@@ -55,6 +55,11 @@ class GlobalConfig:
         # Whether to forcely set stage construction's submesh choices
         self.overwrite_submesh_choices = None
         self.always_donate_micro_batch_vars = True
+        # Whether to trace the function under jax.disable_jit(). Disabling
+        # jit inlines nested jit calls so layer slicing sees a flat jaxpr,
+        # but it makes tracing large models slower. Set this to False if the
+        # model contains no nested jit calls.
+        self.disable_jit_during_trace = True
 
         ########## Options of pipeline runtime ##########
         # Whether to sync before and after the executable for accurate internal
@@ -63,6 +68,17 @@ class GlobalConfig:
         # Whether to use distributed compilation in pipeline parallel for
         # each stage. Disabling it helps debug.
         self.pipeline_distributed_compile = True
+        # Whether to run the per-mesh auto-sharding pass on a thread pool
+        # when distributed compilation is disabled. The XLA pass releases
+        # the GIL, but the ILP solver keeps some module-level debug state,
+        # so this is opt-in.
+        self.parallel_local_compile = False
+        # Whether to cache pipeshard compilation results by the structure of
+        # the traced jaxpr. Unlike the function-identity cache in alpa.api,
+        # this also hits when an equivalent function is retraced (e.g., a new
+        # closure with the same computation). Only used when no sharding
+        # specs are forcibly set.
+        self.cache_pipeshard_compile = False
         self.eagerly_create_communicators = True
         self.pipeline_check_alive = False
         # Whether to use single-byte signal tensor for send/recv.
@@ -92,6 +108,11 @@ class GlobalConfig:
 
         ########## Options of monkey patch ##########
         self.flax_always_use_fp16_embedding = False
+        # Whether to implement nn.Embed by gather instead of onehot + matmul.
+        # The gather reduces the lookup from O(N * V * D) FLOPs to an O(N * D)
+        # index load, but auto-sharding cannot 2d-partition gather/scatter,
+        # so it is only valid when the embedding table is not 2d-partitioned.
+        self.flax_use_embedding_gather = False
 
         ########## Options of logging ##########
         self.print_compilation_time = False
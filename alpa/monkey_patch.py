@@ -15,6 +15,8 @@ from jax.interpreters import pxla
 from jax.interpreters import xla, mlir
 from jax.interpreters.xla import xops
 import flax
+from flax.linen.dtypes import canonicalize_dtype
+from flax.linen.module import compact, wrap_method_once
 
 from alpa.global_env import global_config, is_worker
 
@@ -46,14 +48,28 @@ if is_worker:
 ##### Monkey patch Jax
 ########################################
 
+# Cache of the scalar bound arrays of fast_uniform. Dropout calls
+# fast_uniform with the constant bounds (0.0, 1.0) hundreds of times while
+# tracing a large model, and re-running jnp.asarray for the bounds on every
+# call is measurable trace-time overhead.
+_rng_uniform_bound_cache = {}
+
 
 # Monkey patch random generator to use the stateful random generator.
 # This can simplify the computational graph for dropout.
 def fast_uniform(key, shape=(), dtype=dtypes.float_, minval=0.0, maxval=1.0):
     dtype = dtypes.canonicalize_dtype(dtype)
     shape = core.as_named_shape(shape)
-    minval = jnp.asarray(minval, dtype)
-    maxval = jnp.asarray(maxval, dtype)
+    if isinstance(minval, (int, float)) and isinstance(maxval, (int, float)):
+        cache_key = (dtype, minval, maxval)
+        bounds = _rng_uniform_bound_cache.get(cache_key)
+        if bounds is None:
+            bounds = (jnp.asarray(minval, dtype), jnp.asarray(maxval, dtype))
+            _rng_uniform_bound_cache[cache_key] = bounds
+        minval, maxval = bounds
+    else:
+        minval = jnp.asarray(minval, dtype)
+        maxval = jnp.asarray(maxval, dtype)
     return lax.rng_uniform(minval, maxval, shape.positional)
 
 
@@ -238,10 +254,21 @@ pxla.ShardingSpec.__setstate__ = sharding_spec_setstate
 # Monkey patch the nn.Embed in flax to use onehot + matmul instead of
 # gather/scatter,
 # because we currently do not support 2d partition of gather/scatter.
+# When 2d partition is not required, the O(N * D) gather path can be enabled
+# by global_config.flax_use_embedding_gather. It avoids materializing the
+# O(N * V) one-hot tensor and the O(N * V * D) matmul, which dominate the
+# compute and activation memory of embedding lookup for large vocabularies.
 def embed_call_one_hot(self, inputs):
     dtype = self.dtype
     if global_config.flax_always_use_fp16_embedding:
         dtype = jnp.float16
+    if global_config.flax_use_embedding_gather:
+        if dtype == jnp.float16 and self.dtype == jnp.float16:
+            # Use the pre-cast fp16 copy created in embed_setup.
+            embedding = self.embedding_fp16
+        else:
+            embedding = jnp.asarray(self.embedding, dtype)
+        return jnp.take(embedding, inputs, axis=0)
     expanded = jax.nn.one_hot(inputs, self.embedding.shape[0], dtype=dtype)
     ret = expanded @ jnp.asarray(self.embedding, dtype)
     return ret
@@ -260,6 +287,54 @@ def embed_setup(self):
 flax.linen.Embed.setup = embed_setup
 flax.linen.Embed.__call__ = embed_call_one_hot
 
+# Monkey patch the nn.LayerNorm in flax to compute the statistics in fp32
+# while keeping the input in its original precision.
+# The stock implementation upcasts x before taking the moments, which doubles
+# the HBM traffic of the largest tensor in the layer for fp16/bf16 models.
+backup_layer_norm_call = flax.linen.LayerNorm.__call__
+
+
+def layer_norm_call(self, x):
+    if (self.reduction_axes != -1 or self.feature_axes != -1 or
+            self.axis_name is not None or self.axis_index_groups is not None or
+            x.dtype not in (jnp.float16, jnp.bfloat16, jnp.float32)):
+        # Uncommon configurations fall back to the stock implementation.
+        # fp32 statistics would silently downcast fp64 inputs and compute
+        # wrong moments for complex ones.
+        return backup_layer_norm_call(self, x)
+    features = x.shape[-1]
+    scale = bias = None
+    if self.use_scale:
+        scale = self.param("scale", self.scale_init, (features,),
+                           self.param_dtype)
+    if self.use_bias:
+        bias = self.param("bias", self.bias_init, (features,), self.param_dtype)
+    dtype = canonicalize_dtype(x, scale, bias, dtype=self.dtype)
+    # The astype below stays a fusion operand: x is streamed through HBM in
+    # its original precision while the reductions accumulate in fp32.
+    # Both reductions share the same operand and axes, so XLA's fusion pass
+    # merges them into a single pass over x.
+    x32 = x.astype(jnp.float32)
+    x_sum = jnp.sum(x32, axis=-1, keepdims=True)
+    x2_sum = jnp.sum(lax.square(x32), axis=-1, keepdims=True)
+    mean = x_sum / features
+    var = jnp.maximum(0., x2_sum / features - lax.square(mean))
+    # Low-precision LayerNorm: once the fp32 statistics are ready, cast them
+    # and the params to the output dtype and do all elementwise math there.
+    # Scaling in fp32 and casting the product afterwards would broadcast
+    # rsqrt across the feature dimension in fp32 first, writing the widest
+    # intermediate of the layer at twice the bytes for fp16/bf16 models.
+    mul = lax.rsqrt(var + self.epsilon).astype(dtype)
+    if scale is not None:
+        mul = mul * scale.astype(dtype)
+    y = (x.astype(dtype) - mean.astype(dtype)) * mul
+    if bias is not None:
+        y = y + bias.astype(dtype)
+    return y
+
+
+flax.linen.LayerNorm.__call__ = wrap_method_once(compact(layer_norm_call))
+
 
 # Monkey patch a new method "init_dummy" to flax's Module.
 # This function initializes all weights with ones for testing/benchmark
@@ -267,8 +342,19 @@ flax.linen.Embed.__call__ = embed_call_one_hot
 # This function is much faster than the standard initialization.
 def init_dummy(self, *args, **kwargs):
     avals = jax.eval_shape(self.init, *args, **kwargs)
-    return jax.tree_util.tree_map(lambda x: jnp.full(x.shape, 1e-8, x.dtype),
-                                  avals)
+    # Broadcast a single per-dtype scalar instead of calling jnp.full per
+    # parameter. jnp.full dispatches one fill kernel per parameter, which is
+    # dominated by launch overhead for models with thousands of parameters;
+    # the broadcast of a shared scalar constant is lowered lazily by XLA.
+    scalars = {}
+
+    def make_dummy(x):
+        scalar = scalars.get(x.dtype)
+        if scalar is None:
+            scalar = scalars[x.dtype] = jnp.array(1e-8, x.dtype)
+        return lax.broadcast(scalar, x.shape)
+
+    return jax.tree_util.tree_map(make_dummy, avals)
 
 
 flax.linen.module.Module.init_dummy = init_dummy
@@ -348,31 +348,44 @@ def jaxpr_have_apply_grad(closed_jaxpr: ClosedJaxpr):
                for eqn in closed_jaxpr.eqns)
 
 
+def _make_dummy_microbatch_bound(closed_jaxpr: ClosedJaxpr,
+                                 num_microbatch: int):
+    """Build an empty apply_grad jaxpr and a dummy microbatch bound for a
+    jaxpr without a gradient marker."""
+    dummy_jaxpr = ClosedJaxpr(Jaxpr([], [], [], []), [])
+    invars = list(closed_jaxpr.jaxpr.outvars) if num_microbatch > 1 else []
+    outvars = list(closed_jaxpr.jaxpr.outvars) if num_microbatch > 1 else []
+    dummy_bound = new_jaxpr_eqn(invars, outvars, pipeline_p, {
+        'mark_type': 'grad',
+        'name': ''
+    })
+    return dummy_jaxpr, dummy_bound
+
+
 def split_compute_grad_and_apply_grad(closed_jaxpr: ClosedJaxpr, gensym_fn,
                                       num_microbatch: int,
                                       inference_mode: bool):
     """Split the train_step jaxpr into two parts: compute_grad and
     apply_grad. These two parts are separated by a gradient marker generated
     by `alpa.grad`."""
-    # Locate the marker
+    # Locate the last marker. Scan from the end: the marker sits between
+    # compute_grad and apply_grad, so only the short apply_grad tail is
+    # walked instead of the whole compute_grad body.
     split_eqn = None
-    for idx, eqn in enumerate(closed_jaxpr.eqns):
+    for idx in range(len(closed_jaxpr.eqns) - 1, -1, -1):
+        eqn = closed_jaxpr.eqns[idx]
         if eqn.primitive is pipeline_p and eqn.params['mark_type'] == 'grad':
             split_eqn = eqn
             split_idx = idx
+            break
     if split_eqn is None:
         if not inference_mode:
             logger.warning(
                 'Missing microbatch_bound between compute and apply. '
                 'Assume there is no apply gradient step. '
                 'Hint: replace jax.grad by alpa.grad.')
-        dummy_jaxpr = ClosedJaxpr(Jaxpr([], [], [], []), [])
-        invars = list(closed_jaxpr.jaxpr.outvars) if num_microbatch > 1 else []
-        outvars = list(closed_jaxpr.jaxpr.outvars) if num_microbatch > 1 else []
-        dummy_bound = new_jaxpr_eqn(invars, outvars, pipeline_p, {
-            'mark_type': 'grad',
-            'name': ''
-        })
+        dummy_jaxpr, dummy_bound = _make_dummy_microbatch_bound(
+            closed_jaxpr, num_microbatch)
         return closed_jaxpr, closed_jaxpr, dummy_jaxpr, dummy_bound
     sliced_eqns = [
         closed_jaxpr.eqns[:split_idx], split_eqn,
@@ -410,7 +423,8 @@ def _get_post_to_pre_marker_mapping(compute_jaxpr):
     post_marker_outs = _filter_droped(compute_jaxpr.jaxpr.outvars)
     # Currently, assume no grad is literal
     assert len(post_marker_outs) == len(compute_jaxpr.jaxpr.outvars)
-    post_marker_outs = OrderedSet(post_marker_outs)
+    # membership-only, so a plain set is enough
+    post_marker_outs = set(post_marker_outs)
     # from post_marker_outs to post_to_pre_marker_outs(cross pipeline marker)
     post_to_pre_marker_outs = {}
     pre_to_post_marker_outs = {}
@@ -442,7 +456,7 @@ def _rewrite_jaxpr_to_reduced_outputs(compute_jaxpr, to_reduce_pre_marker_outs,
     pipe_start = None
     pipe_eqns = []
     to_acc = []
-    to_reduce_pre_marker_outs = OrderedSet(to_reduce_pre_marker_outs)
+    to_reduce_pre_marker_outs = set(to_reduce_pre_marker_outs)
     for eqn in compute_jaxpr.eqns:
         if eqn.primitive is pipeline_p:
             if eqn.params['mark_type'] == 'start':
@@ -656,8 +670,9 @@ def apply_grad_get_mean(apply_grad_jaxpr, global_outvars, gradients, gensym_fn,
     """
     mapping = {}
     new_eqns = []
-    invar_set = OrderedSet(apply_grad_jaxpr.jaxpr.invars)
-    outvar_set = OrderedSet(apply_grad_jaxpr.jaxpr.outvars)
+    invar_set = set(apply_grad_jaxpr.jaxpr.invars)
+    outvar_set = set(apply_grad_jaxpr.jaxpr.outvars)
+    global_outvar_set = set(_filter_literal(global_outvars))
     for invar, reduce in zip(gradients, reduce_invars):
         if not reduce:
             mapping[invar] = invar
@@ -677,7 +692,7 @@ def apply_grad_get_mean(apply_grad_jaxpr, global_outvars, gradients, gensym_fn,
             continue
         if invar not in invar_set:
             final_invars.append(invar)
-        if invar in global_outvars and invar not in outvar_set:
+        if invar in global_outvar_set and invar not in outvar_set:
             # use the divided version to replace the original one
             final_outvars.append(mapping[invar])
     new_eqns.extend(replaced.jaxpr.eqns)
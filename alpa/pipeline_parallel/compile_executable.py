@@ -1,9 +1,12 @@
 """Compile executables for pipeshard parallelism."""
+from concurrent.futures import ThreadPoolExecutor
 import dataclasses
+import functools
 import logging
 import time
 from typing import Callable, Sequence, Optional
 
+import numpy as np
 from jax import linear_util as lu
 from jax._src.lib import xla_client as xc
 from jax.core import gensym, AbstractValue, ClosedJaxpr
@@ -44,6 +47,16 @@ from alpa.util import (get_var_mapping, trace_jaxpr_with_micro_batch,
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# A content-addressed cache of compiled PipeshardConfigs, keyed on the
+# structure of the traced jaxpr and the compilation options. See
+# global_config.cache_pipeshard_compile.
+_pipeshard_compile_cache = {}
+
+
+def clear_pipeshard_compile_cache():
+    """Clear the content-addressed pipeshard compilation cache."""
+    _pipeshard_compile_cache.clear()
+
 
 def compile_pipeshard_executable(
         fun: lu.WrappedFun, in_tree: PyTreeDef,
@@ -108,11 +121,40 @@ def compile_pipeshard_executable(
                                                       in_tree, out_tree)
     else:
         parsed_ms_option = None
-    pipeshard_config = compile_pipeshard_executable_internal(
-        closed_jaxpr, full_batch_closed_jaxpr, micro_batch_size, donated_invars,
-        batch_invars, virtual_mesh, num_microbatch, pipeline_schedule,
-        default_as_option, stage_option, name_base, global_input_shardings,
-        None, stage_input_shardings, parsed_ms_option)
+
+    # The lu.cache in alpa.api keys on the function identity, so retracing an
+    # equivalent function (e.g., a new closure with the same computation)
+    # recompiles from scratch. The secondary cache below keys on the traced
+    # jaxpr structure instead. Forcibly-set sharding specs are not hashable,
+    # so those calls bypass the cache.
+    cache_key = None
+    if (global_config.cache_pipeshard_compile and
+            global_input_shardings is None and stage_input_shardings is None and
+            manual_shard_options is None):
+        cache_key = (str(closed_jaxpr), str(full_batch_closed_jaxpr),
+                     micro_batch_size, tuple(donated_invars),
+                     tuple(batch_invars), num_microbatch, pipeline_schedule,
+                     repr(default_as_option), repr(stage_option))
+    # The cached entry keeps a reference to its virtual mesh and only hits
+    # when the meshes are identical, so a freed mesh whose address is reused
+    # by a new VirtualPhysicalMesh cannot cause a false hit. The stage
+    # executables inside a cached config are shared by all executables built
+    # from it; the mesh workers refcount them (see MeshHostWorker).
+    cached = (_pipeshard_compile_cache.get(cache_key)
+              if cache_key is not None else None)
+    if cached is not None and cached[0] is virtual_mesh:
+        pipeshard_config = cached[1]
+        debug_compilation_time("pipeshard cache hit")
+    else:
+        pipeshard_config = compile_pipeshard_executable_internal(
+            closed_jaxpr, full_batch_closed_jaxpr, micro_batch_size,
+            donated_invars, batch_invars, virtual_mesh, num_microbatch,
+            pipeline_schedule, default_as_option, stage_option, name_base,
+            global_input_shardings, None, stage_input_shardings,
+            parsed_ms_option)
+        if cache_key is not None:
+            _pipeshard_compile_cache[cache_key] = (virtual_mesh,
+                                                   pipeshard_config)
 
     executable = PipeshardDriverExecutable(
         mesh_group=virtual_mesh.launched_physical_mesh_group,
@@ -232,6 +274,19 @@ def compile_pipeshard_executable_internal(
         input_sharding_dicts = [input_sharding_dict] * num_meshes
         output_sharding_dicts = [output_sharding_dict] * num_meshes
 
+    # Launch the physical mesh group concurrently with the auto-sharding
+    # pass below. The two are independent and both take a long time: the
+    # launch waits on Ray actor startup while the sharding pass is
+    # compute-bound, so overlapping them hides the actor startup latency.
+    # The future carries any launch exception (e.g., Ray cannot allocate
+    # the requested resources) to the join point below.
+    launch_future = None
+    if virtual_mesh.launched_physical_mesh_group is None:
+        launch_executor = ThreadPoolExecutor(max_workers=1)
+        launch_future = launch_executor.submit(
+            virtual_mesh.get_physical_mesh_group, sliced_virtual_meshes)
+        launch_executor.shutdown(wait=False)
+
     # Call auto-sharding pass to shard each stage
     xla_stages, total_flops = shard_each_stage(
         jax_all_stages, sliced_virtual_meshes, schedule, num_meshes,
@@ -244,9 +299,11 @@ def compile_pipeshard_executable_internal(
     total_flops *= num_microbatch
     debug_compilation_time("shard stages")
 
-    # Launch the physical mesh group
-    if virtual_mesh.launched_physical_mesh_group is None:
-        virtual_mesh.get_physical_mesh_group(sliced_virtual_meshes)
+    # Wait for the physical mesh group. result() re-raises any exception
+    # from the launch with its original traceback.
+    if launch_future is not None:
+        launch_future.result()
+    assert virtual_mesh.launched_physical_mesh_group is not None
     debug_compilation_time("launch meshes")
 
     # Wrap all things into a distributed runtime
@@ -438,10 +495,14 @@ def shard_each_stage(jax_all_stages, virtual_meshes, schedule, num_meshes,
         stage_input_shardings = [None for _ in range(num_meshes)]
     assert len(stage_input_shardings) == num_meshes
 
+    # Read the placement map once instead of calling stage_placement per
+    # stage: the map is a cached property, so the per-stage calls only paid
+    # method dispatch and list() materialization in a hot compile loop.
+    stage_placements = schedule.stage_mesh_mapping
     for i, stage in enumerate(jax_all_stages):
-        mesh_indices = list(schedule.stage_placement(i))
+        mesh_indices = stage_placements[i]
         assert len(mesh_indices) == 1
-        mesh_idx = mesh_indices[0]
+        mesh_idx = next(iter(mesh_indices))
         if len(stage.outvars) == 0:
             # This is a dummy stage, we don't need to shard it
             dummy_stage_id_dict[mesh_idx].append(i)
@@ -457,11 +518,19 @@ def shard_each_stage(jax_all_stages, virtual_meshes, schedule, num_meshes,
         compile_workers = CompileWorkerPool(num_meshes)
         compile_fn = lambda w, v: w.run_auto_sharding_pass.remote(*v)  # pylint: disable=unnecessary-lambda-assignment
         compile_intermediate = [None] * num_meshes
+    parallel_local_compile = (not distributed_compile and
+                              global_config.parallel_local_compile)
+    local_compile_tasks = []
     total_flops = 0
+    # Materialize all logical meshes before the compile loop so the
+    # LogicalDeviceMesh construction is not interleaved with the sharding
+    # passes (and is built once even when tasks are deferred to threads).
+    logical_meshes = [
+        virtual_meshes[mesh_idx].get_logical_mesh(logical_mesh_shapes[mesh_idx])
+        for mesh_idx in range(num_meshes)
+    ]
     for mesh_idx in range(num_meshes):
-        virtual_mesh = virtual_meshes[mesh_idx]
-        logical_mesh = virtual_mesh.get_logical_mesh(
-            logical_mesh_shapes[mesh_idx])
+        logical_mesh = logical_meshes[mesh_idx]
         autosharding_option = dataclasses.replace(
             default_as_option, **autosharding_option_dicts[mesh_idx])
 
@@ -497,11 +566,28 @@ def shard_each_stage(jax_all_stages, virtual_meshes, schedule, num_meshes,
                                               stage_donate_invars)
             total_flops += flops
         else:
-            sharded_xla_stages, flops = generate_sharded_xla_computations(
+            compile_task = functools.partial(
+                generate_sharded_xla_computations,
                 f"{name_base}_mesh_{mesh_idx}", stage_dict[mesh_idx],
                 stage_donate_invars, donatable_dict[mesh_idx], acc_grad_outvars,
                 num_microbatch, logical_mesh, autosharding_option,
                 input_sharding_dict, output_sharding_dict, stage_input_sharding)
+            if parallel_local_compile:
+                # The auto-sharding pass releases the GIL inside XLA, so
+                # running the meshes on threads overlaps most of the work.
+                local_compile_tasks.append((mesh_idx, compile_task))
+                continue
+            sharded_xla_stages, flops = compile_task()
+            total_flops += flops
+            for i, xla_stage in zip(stage_id_dict[mesh_idx],
+                                    sharded_xla_stages):
+                xla_stages[i] = xla_stage
+
+    if local_compile_tasks:
+        with ThreadPoolExecutor(max_workers=num_meshes) as executor:
+            futures = [executor.submit(task) for _, task in local_compile_tasks]
+        for (mesh_idx, _), future in zip(local_compile_tasks, futures):
+            sharded_xla_stages, flops = future.result()
             total_flops += flops
             for i, xla_stage in zip(stage_id_dict[mesh_idx],
                                     sharded_xla_stages):
@@ -533,13 +619,14 @@ def slice_apply_grad_for_stage_construction(pipeline_layers, apply_grad_jaxpr,
     if inference_mode:
         num_layers = len(pipeline_layers)
         num_mesh = num_layers
-        layer_to_mesh = list(range(num_mesh))
+        layer_to_mesh = np.arange(num_mesh)
     else:
         num_layers = len(pipeline_layers)
         assert len(pipeline_layers) % 2 == 0
         num_mesh = num_layers // 2
-        layer_to_mesh = (list(range(num_mesh)) +
-                         list(reversed(range(num_mesh))))
+        # [0, ..., n - 1, n - 1, ..., 0]
+        layer_ids = np.arange(num_layers)
+        layer_to_mesh = np.minimum(layer_ids, num_layers - 1 - layer_ids)
     (layers, apply_grad_placement, global_outvars,
      _) = process_apply_gradient(apply_grad_jaxpr, microbatch_bound,
                                  pipeline_layers, layer_to_mesh, gensym_func,
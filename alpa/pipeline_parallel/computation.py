@@ -443,10 +443,19 @@ def mark_missing_vars_in_backward_computation_pipeline_marks(
     assert len(computations) % 2 == 0.
     num_forward_computations = len(computations) // 2
 
+    # Key membership structures by id(var): Var hashes by identity anyway,
+    # and precomputed id-sets replace the O(n) list scans over
+    # computation.invars/outvars in the inner loop below.
     var_computation_id = {}
     for var in global_invars:
         if not isinstance(var, Literal):
-            var_computation_id[var] = -1
+            var_computation_id[id(var)] = -1
+    computation_invar_ids = [
+        {id(var) for var in computation.invars} for computation in computations
+    ]
+    computation_outvar_ids = [
+        {id(var) for var in computation.outvars} for computation in computations
+    ]
 
     computation_marked_to_unmarked_invars = [{} for _ in computations]
     computation_weight_invars = [{} for _ in computations]
@@ -462,8 +471,8 @@ def mark_missing_vars_in_backward_computation_pipeline_marks(
             for var in eqn.invars:
                 if (not isinstance(var, Literal) and
                         var not in computation.consts_dir and
-                        var not in computation.invars):
-                    source_computation_id = var_computation_id[var]
+                        id(var) not in computation_invar_ids[computation_id]):
+                    source_computation_id = var_computation_id[id(var)]
                     if source_computation_id != computation_id:
                         # Special case for the model weights. If a backward
                         # computation is using an invar of a forward
@@ -481,18 +490,18 @@ def mark_missing_vars_in_backward_computation_pipeline_marks(
                             continue
                         # Mark all the variables in the backward computation
                         # that are not currently defined in pipeline markers.
-                        if (source_computation_id != -1 and var not in
-                                computations[source_computation_id].outvars):
+                        if (source_computation_id != -1 and id(var) not in
+                                computation_outvar_ids[source_computation_id]):
                             computation_additional_outvars[
                                 source_computation_id].add(var)
                         computation_additional_invars[computation_id].add(var)
             for var in eqn.outvars:
-                var_computation_id[var] = computation_id
+                var_computation_id[id(var)] = computation_id
 
     for var in global_outvars:
-        source_computation_id = var_computation_id[var]
-        if source_computation_id != -1 and var not in computations[
-                source_computation_id].outvars:
+        source_computation_id = var_computation_id[id(var)]
+        if source_computation_id != -1 and id(
+                var) not in computation_outvar_ids[source_computation_id]:
             computation_additional_outvars[source_computation_id].add(var)
 
     new_computations = []
@@ -579,17 +588,36 @@ def pipeline_dce(jax_pipeline_computations: Sequence[JaxPipelineComputation],
     This function removes grad and only keeps accumulated grad.
     """
 
-    def dce_pipe_marker(marker: JaxprEqn, used_set):
-        kept_indices = [
-            i for i, var in enumerate(marker.outvars) if var in used_set
-        ]
+    # Assign a dense index to every var so the liveness sets become numpy
+    # bool masks. The pipeline markers of a large model carry thousands of
+    # vars, and masks let dce_pipe_marker filter them with vectorized ops
+    # instead of a per-var membership test.
+    var_index = {}
+    for computation in jax_pipeline_computations:
+        for eqn in computation.eqns:
+            for var in eqn.invars:
+                if isinstance(var, Var):
+                    var_index.setdefault(id(var), len(var_index))
+            for var in eqn.outvars:
+                var_index.setdefault(id(var), len(var_index))
+    for var in global_outvars:
+        var_index.setdefault(id(var), len(var_index))
+
+    def var_indices(vars):
+        return np.fromiter((var_index[id(var)] for var in vars),
+                           dtype=np.int64,
+                           count=len(vars))
+
+    def dce_pipe_marker(marker: JaxprEqn, used_mask):
+        kept_indices = np.flatnonzero(used_mask[var_indices(marker.outvars)])
         new_marker = mark_pipeline_jaxpreqn(
             [marker.invars[i] for i in kept_indices],
             [marker.outvars[i] for i in kept_indices], marker.params["name"],
             marker.params["mark_type"])
         return new_marker
 
-    global_used = OrderedSet(global_outvars)
+    global_used = np.zeros(len(var_index), dtype=bool)
+    global_used[var_indices(global_outvars)] = True
     new_computations = []
     for computation in reversed(jax_pipeline_computations):
         new_eqns = []
@@ -601,14 +629,15 @@ def pipeline_dce(jax_pipeline_computations: Sequence[JaxPipelineComputation],
         new_pipe_end = dce_pipe_marker(pipe_end, global_used)
         new_eqns.append(new_pipe_end)
         # handle normal instructions
-        local_used = OrderedSet(new_pipe_end.invars)
+        local_used = np.zeros(len(var_index), dtype=bool)
+        local_used[var_indices(new_pipe_end.invars)] = True
         for eqn in reversed(computation.eqns[1:-1]):
             for outvar in eqn.outvars:
-                if not isinstance(outvar, DropVar) and outvar in local_used:
+                if (not isinstance(outvar, DropVar) and
+                        local_used[var_index[id(outvar)]]):
                     new_eqns.append(eqn)
-                    local_used.update([
-                        invar for invar in eqn.invars if isinstance(invar, Var)
-                    ])
+                    local_used[var_indices(
+                        [v for v in eqn.invars if isinstance(v, Var)])] = True
                     break
         # handle pipe start
         pipe_start = computation.eqns[0]
@@ -617,7 +646,7 @@ def pipeline_dce(jax_pipeline_computations: Sequence[JaxPipelineComputation],
                 == "start"), "computation not started by a pipeline marker"
         new_pipe_start = dce_pipe_marker(pipe_start, local_used)
         new_eqns.append(new_pipe_start)
-        global_used.update(new_pipe_start.invars)
+        global_used[var_indices(new_pipe_start.invars)] = True
 
         new_eqns = list(reversed(new_eqns))
         new_computation = JaxPipelineComputation(
@@ -1014,7 +1043,9 @@ def get_local_donation_mapping_and_add_missing_invars(computation,
     function add the invar and create a new computation and corresponding to
     the donation mapping.
     """
-    invars = OrderedSet(computation.invars)
+    # Membership tests are keyed on id(var) to avoid the Python-level
+    # Var hashing overhead; this helper runs once per stage over all invars.
+    invar_ids = {id(var) for var in computation.invars}
     donation_mapping = {}
     appended_invars = OrderedSet()
     for var in computation.outvars:
@@ -1023,7 +1054,7 @@ def get_local_donation_mapping_and_add_missing_invars(computation,
         invar = reversed_donation_mapping[var]
         assert invar.aval.shape == var.aval.shape
         donation_mapping[invar] = var
-        if invar not in invars:
+        if id(invar) not in invar_ids:
             appended_invars.add(invar)
     if not donation_mapping:
         return donation_mapping, computation
@@ -1112,29 +1143,33 @@ def get_donatable_intermediate(stages: Sequence[JaxPipelineComputation],
         donatable_list (Sequence[OrderedSet[Var]]): donatable invars of each
             stage.
     """
-    global_invars = OrderedSet(global_invars)
+    # All lookup tables are keyed on id(var). This pass does a hash lookup
+    # for every invar of every stage, so the cheaper C-level int hashing
+    # matters for large stage counts.
+    global_invar_ids = {id(var) for var in global_invars}
     main_copy_at = {}
     stage_at = {}
     for mesh_idx, stage_indices in worker_stage_mapping.items():
         for stage_idx in stage_indices:
             stage = stages[stage_idx]
             for outvar in stage.outvars:
-                main_copy_at[outvar] = mesh_idx
+                main_copy_at[id(outvar)] = mesh_idx
             stage_at[stage_idx] = mesh_idx
 
     donatable_list = []
-    used = OrderedSet()
+    used_ids = set()
     for stage_idx in reversed(range(len(stages))):
         stage = stages[stage_idx]
         donatable = OrderedSet()
         for invar in stage.invars:
-            if invar in global_invars:
+            invar_id = id(invar)
+            if invar_id in global_invar_ids:
                 continue  # do not consider global inputs
-            if main_copy_at[invar] != stage_at[stage_idx]:
+            if main_copy_at[invar_id] != stage_at[stage_idx]:
                 donatable.add(invar)  # not a main copy
-            if invar not in used:
+            if invar_id not in used_ids:
                 donatable.add(invar)  # is a main copy never used
-        used.update(stage.invars)
+        used_ids.update(id(invar) for invar in stage.invars)
         donatable_list.append(donatable)
     donatable_list = list(reversed(donatable_list))
     return donatable_list
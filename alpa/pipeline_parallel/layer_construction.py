@@ -50,21 +50,29 @@ class ManualLayerOption(LayerOption):
 
     Args:
       remat_layer: Whether to use gradient rematerialization for each layer.
+      remat_policy: An optional jax.checkpoint policy (e.g.
+        jax.checkpoint_policies.save_only_these_names) deciding which
+        intermediates are saved instead of rematerialized. Note that this
+        option is stored in PipelinePlan, so a callable policy makes a
+        saved plan unpicklable.
       static_argnums: The indices of static arguments of the
         forward function.
     """
 
     def __init__(self,
                  remat_layer: bool = False,
+                 remat_policy: Optional[Callable] = None,
                  static_argnums: Sequence[int] = ()):
         self.remat_layer = remat_layer
+        self.remat_policy = remat_policy
         self.static_argnums = static_argnums
         super().__init__()
 
     def transform(self, func):
         return manual_layer_construction(func,
                                          static_argnums=self.static_argnums,
-                                         remat_layer=self.remat_layer)
+                                         remat_layer=self.remat_layer,
+                                         remat_policy=self.remat_policy)
 
 
 class AutoLayerOption(LayerOption):
@@ -83,6 +91,11 @@ class AutoLayerOption(LayerOption):
       fine_grained_remat_layer_num:
         Only used for remat_mode == "fine_grained_remat".
         The number of layers for auto_remat.
+      remat_policy: An optional jax.checkpoint policy (e.g.
+        jax.checkpoint_policies.save_only_these_names) deciding which
+        intermediates are saved instead of rematerialized. Note that this
+        option is stored in PipelinePlan, so a callable policy makes a
+        saved plan unpicklable.
       static_argnums: The indices of static arguments of the
         forward function.
       eps: The tolerance of inbalance of the costs of different layers.
@@ -92,19 +105,22 @@ class AutoLayerOption(LayerOption):
                  layer_num: int,
                  remat_mode: str = "none",
                  fine_grained_remat_layer_num: Optional[int] = None,
+                 remat_policy: Optional[Callable] = None,
                  static_argnums: Sequence[int] = (),
                  eps: float = DEFAULT_EPS):
         super().__init__()
         self.layer_num = layer_num
         self.remat_mode = remat_mode
         self.fine_grained_remat_layer_num = fine_grained_remat_layer_num
+        self.remat_policy = remat_policy
         self.static_argnums = static_argnums
         self.eps = eps
 
     def transform(self, func):
         if self.remat_mode == "fine_grained_remat":
             func = automatic_remat(func,
-                                   layer_num=self.fine_grained_remat_layer_num)
+                                   layer_num=self.fine_grained_remat_layer_num,
+                                   remat_policy=self.remat_policy)
             use_remat = False
         elif self.remat_mode == "coarse_grained_remat":
             use_remat = True
@@ -115,6 +131,7 @@ class AutoLayerOption(LayerOption):
                                             static_argnums=self.static_argnums,
                                             layer_num=self.layer_num,
                                             remat_layer=use_remat,
+                                            remat_policy=self.remat_policy,
                                             eps=self.eps)
 
 
@@ -265,8 +282,17 @@ def add_pipeline_marks_for_sliced_eqns(closed_jaxpr: ClosedJaxpr, sliced_eqns):
     return new_closed_jaxpr
 
 
-def remat_sliced_eqns(origin_jaxpr, sliced_eqns):
-    """Add tensor rematerialization for sliced equations."""
+def remat_sliced_eqns(origin_jaxpr, sliced_eqns, policy=None):
+    """Add tensor rematerialization for sliced equations.
+
+    Args:
+        origin_jaxpr: The jaxpr containing the sliced equations.
+        sliced_eqns: The equations grouped by layer.
+        policy: An optional jax.checkpoint policy (e.g.
+          jax.checkpoint_policies.save_only_these_names) deciding which
+          intermediates of a layer are saved instead of rematerialized.
+          None saves nothing but the layer boundaries.
+    """
     ret_eqns = []
 
     sliced_jaxprs = slices_to_jaxpr(origin_jaxpr, sliced_eqns)
@@ -279,7 +305,7 @@ def remat_sliced_eqns(origin_jaxpr, sliced_eqns):
                 dict(jaxpr=new_jaxpr,
                      prevent_cse=True,
                      differentiated=False,
-                     policy=None))
+                     policy=policy))
         ])
     return ret_eqns
 
@@ -490,6 +516,7 @@ def search_layer_num(jaxpr,
 def layer_level_jaxpr_transformation(fn: Callable,
                                      static_argnums: Sequence[int] = (),
                                      remat: bool = False,
+                                     remat_policy: Optional[Callable] = None,
                                      layer_construction: bool = False,
                                      auto_layer_boundary: bool = False,
                                      layer_num: Union[int, str] = None,
@@ -523,7 +550,7 @@ def layer_level_jaxpr_transformation(fn: Callable,
             log_layer_slicing_stats(jaxpr, sliced_eqns)
 
         if remat:
-            sliced_eqns = remat_sliced_eqns(jaxpr, sliced_eqns)
+            sliced_eqns = remat_sliced_eqns(jaxpr, sliced_eqns, remat_policy)
 
         if layer_construction:
             jaxpr = add_pipeline_marks_for_sliced_eqns(jaxpr, sliced_eqns)
@@ -539,7 +566,10 @@ def layer_level_jaxpr_transformation(fn: Callable,
     return wrapped
 
 
-def manual_remat(fun: Callable = None, *, static_argnums: Sequence[int] = ()):
+def manual_remat(fun: Callable = None,
+                 *,
+                 static_argnums: Sequence[int] = (),
+                 remat_policy: Optional[Callable] = None):
     """Rematerialize an input function with manually selected layer boundaries.
 
     Rematerialize each layer of an input function with manually selected layer
@@ -550,6 +580,8 @@ def manual_remat(fun: Callable = None, *, static_argnums: Sequence[int] = ()):
         static_argnums: An optional int or collection of ints that specify
           which positional arguments to treat as static (compile-time constant).
           Same as in jax.jit
+        remat_policy: An optional jax.checkpoint policy deciding which
+          intermediates are saved instead of rematerialized.
     Returns:
         A new function rematerializes each layer of the input function.
     """
@@ -558,6 +590,7 @@ def manual_remat(fun: Callable = None, *, static_argnums: Sequence[int] = ()):
         return layer_level_jaxpr_transformation(fun,
                                                 static_argnums,
                                                 remat=True,
+                                                remat_policy=remat_policy,
                                                 layer_construction=False,
                                                 auto_layer_boundary=False)
 
@@ -572,6 +605,7 @@ def automatic_remat(fun: Callable = None,
                     *,
                     static_argnums: Sequence[int] = (),
                     layer_num: Union[int, str] = None,
+                    remat_policy: Optional[Callable] = None,
                     eps: float = DEFAULT_EPS,
                     cost_criteria: str = DEFAULT_COST_CRITERIA,
                     layer_eps: float = 0.0):
@@ -588,6 +622,8 @@ def automatic_remat(fun: Callable = None,
         layer_num: The number of layers to rematerialize. If set to "auto", the
           number of layers will be automatically determined by a binary search.
           The binary search might not work for complex input functions.
+        remat_policy: An optional jax.checkpoint policy deciding which
+          intermediates are saved instead of rematerialized.
         eps: The tolerance of inbalance of the costs of different layers.
         cost_criteria: The cost criteria to use for deciding the layers.
         layer_eps: A parameter for layer_num binary search.
@@ -600,6 +636,7 @@ def automatic_remat(fun: Callable = None,
         return layer_level_jaxpr_transformation(fun,
                                                 static_argnums,
                                                 remat=True,
+                                                remat_policy=remat_policy,
                                                 layer_construction=False,
                                                 auto_layer_boundary=True,
                                                 layer_num=layer_num,
@@ -617,7 +654,8 @@ def automatic_remat(fun: Callable = None,
 def manual_layer_construction(fun: Callable = None,
                               *,
                               static_argnums: Sequence[int] = (),
-                              remat_layer: bool = False):
+                              remat_layer: bool = False,
+                              remat_policy: Optional[Callable] = None):
     """Setup manually selected layer boundaries.
 
     Add input variables of each layer to its start pipeline marker and output
@@ -629,6 +667,8 @@ def manual_layer_construction(fun: Callable = None,
           which positional arguments to treat as static (compile-time constant).
           Same as in jax.jit
         remat_layer: Whether to rematerialize each layer at layer boundaries.
+        remat_policy: An optional jax.checkpoint policy deciding which
+          intermediates are saved instead of rematerialized.
     Returns:
         A new function with correctly setup pipeline markers.
     """
@@ -637,6 +677,7 @@ def manual_layer_construction(fun: Callable = None,
         return layer_level_jaxpr_transformation(fun,
                                                 static_argnums,
                                                 remat=remat_layer,
+                                                remat_policy=remat_policy,
                                                 layer_construction=True,
                                                 auto_layer_boundary=False)
 
@@ -652,6 +693,7 @@ def automatic_layer_construction(fun: Callable = None,
                                  static_argnums: Sequence[int] = (),
                                  layer_num: int = None,
                                  remat_layer: bool = False,
+                                 remat_policy: Optional[Callable] = None,
                                  eps: float = DEFAULT_EPS,
                                  cost_criteria: str = DEFAULT_COST_CRITERIA,
                                  layer_eps: float = 0.0):
@@ -667,6 +709,8 @@ def automatic_layer_construction(fun: Callable = None,
           number of layers will be automatically determined by a binary search.
           The binary search might not work for complex input functions.
         remat_layer: Whether to rematerialize each layer at layer boundaries.
+        remat_policy: An optional jax.checkpoint policy deciding which
+          intermediates are saved instead of rematerialized.
         eps: the tolerance of inbalance of the costs of different layers.
         cost_criteria: the cost criteria to use for deciding the layers.
         layer_eps: a parameter for layer_num binary search.
@@ -678,6 +722,7 @@ def automatic_layer_construction(fun: Callable = None,
         return layer_level_jaxpr_transformation(fun,
                                                 static_argnums,
                                                 remat=remat_layer,
+                                                remat_policy=remat_policy,
                                                 layer_construction=True,
                                                 auto_layer_boundary=True,
                                                 layer_num=layer_num,
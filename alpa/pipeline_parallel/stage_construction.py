@@ -751,14 +751,16 @@ def cluster_layers_and_slice_mesh(
 
     if inference_mode:
         stage_layer_ids = forward_stage_layer_ids
-        stage_to_mesh = list(range(num_forward_stages))
+        stage_to_mesh = np.arange(num_forward_stages)
     else:
         backward_stage_layer_ids = [[
             2 * num_layers - 1 - i for i in reversed(layer_ids)
         ] for layer_ids in reversed(forward_stage_layer_ids)]
         stage_layer_ids = forward_stage_layer_ids + backward_stage_layer_ids
-        stage_to_mesh = list(range(num_forward_stages)) + list(
-            reversed(range(num_forward_stages)))
+        # [0, ..., n - 1, n - 1, ..., 0]
+        stage_ids = np.arange(2 * num_forward_stages)
+        stage_to_mesh = np.minimum(stage_ids,
+                                   2 * num_forward_stages - 1 - stage_ids)
 
     stage_outvars = get_stage_outvars(layers, stage_layer_ids, acc_grad_outvars)
     merged_stages = []
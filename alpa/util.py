@@ -893,7 +893,13 @@ def trace_jaxpr_with_micro_batch(fun: lu.WrappedFun,
             avals.append(aval.update(shape=shape))
         else:
             avals.append(aval)
-    with jax.disable_jit():
+    if global_config.disable_jit_during_trace:
+        # Disabling jit inlines nested jit calls (e.g., jax.nn.one_hot),
+        # so layer slicing sees the flat equation list. If the model has no
+        # nested jit, turning this off makes tracing of large models faster.
+        with jax.disable_jit():
+            jaxpr, _, consts = pe.trace_to_jaxpr_final(fun, avals)
+    else:
         jaxpr, _, consts = pe.trace_to_jaxpr_final(fun, avals)
     closed_jaxpr = ClosedJaxpr(jaxpr, consts)
 
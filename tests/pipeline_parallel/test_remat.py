@@ -1,6 +1,11 @@
 import unittest
 
 import jax
+from jax._src.ad_checkpoint import remat_p
+from jax._src.api import make_jaxpr
+import jax.numpy as jnp
+
+from alpa import AutoLayerOption, ManualLayerOption
 from alpa.testing import PipelineBasicTest
 
 
@@ -9,6 +14,25 @@ class PipelineRematTest(PipelineBasicTest):
     def test_mlp_remat(self):
         self.run_mlp(use_remat=True)
 
+    def test_remat_policy_reaches_remat_eqns(self):
+        policy = jax.checkpoint_policies.save_only_these_names("hidden")
+
+        def fn(x):
+            return jnp.tanh(x @ x) + 1.0
+
+        options = [
+            ManualLayerOption(remat_layer=True, remat_policy=policy),
+            AutoLayerOption(layer_num=1,
+                            remat_mode="coarse_grained_remat",
+                            remat_policy=policy),
+        ]
+        for option in options:
+            jaxpr = make_jaxpr(option.transform(fn))(jnp.ones((4, 4)))
+            remat_eqns = [eqn for eqn in jaxpr.eqns if eqn.primitive is remat_p]
+            assert len(remat_eqns) > 0
+            for eqn in remat_eqns:
+                assert eqn.params["policy"] is policy
+
     def test_2_layer_bert_remat(self):
         self.run_n_layer_bert(num_layers=2, use_remat=True)
 
@@ -27,6 +51,7 @@ class PipelineRematTest(PipelineBasicTest):
 def suite():
     suite = unittest.TestSuite()
     suite.addTest(PipelineRematTest('test_mlp_remat'))
+    suite.addTest(PipelineRematTest('test_remat_policy_reaches_remat_eqns'))
     suite.addTest(PipelineRematTest('test_2_layer_bert_remat'))
     suite.addTest(
         PipelineRematTest('test_2_layer_bert_auto_layer_slicing_remat'))
@@ -0,0 +1,82 @@
+"""Test the monkey patches applied to flax."""
+import unittest
+
+from flax import linen as nn
+import jax
+import jax.numpy as jnp
+
+from alpa.global_env import global_config
+from alpa.monkey_patch import backup_layer_norm_call
+from alpa.testing import assert_allclose
+
+
+class LayerNormPatchTest(unittest.TestCase):
+    """Compare the patched nn.LayerNorm against the stock implementation."""
+
+    def _run_layer_norm(self, x_dtype, model_dtype, rtol, atol):
+        x = jax.random.normal(jax.random.PRNGKey(0), (8, 32), dtype=x_dtype)
+        model = nn.LayerNorm(dtype=model_dtype)
+        params = model.init(jax.random.PRNGKey(1), x)
+        actual = model.apply(params, x)
+        expected = model.apply(params, x, method=backup_layer_norm_call)
+        assert actual.dtype == expected.dtype
+        assert_allclose(actual, expected, rtol=rtol, atol=atol)
+
+    def test_layer_norm_fp32(self):
+        self._run_layer_norm(jnp.float32, jnp.float32, 1e-6, 1e-6)
+
+    def test_layer_norm_fp16(self):
+        self._run_layer_norm(jnp.float16, jnp.float16, 2e-3, 2e-3)
+
+    def test_layer_norm_bf16(self):
+        self._run_layer_norm(jnp.bfloat16, jnp.bfloat16, 2e-2, 2e-2)
+
+    def test_layer_norm_fp64_fallback(self):
+        # fp64 inputs must take the stock implementation, not the fp32
+        # statistics path.
+        jax.config.update("jax_enable_x64", True)
+        try:
+            self._run_layer_norm(jnp.float64, jnp.float64, 0, 0)
+        finally:
+            jax.config.update("jax_enable_x64", False)
+
+
+class EmbedPatchTest(unittest.TestCase):
+    """Compare the gather-based nn.Embed path against the one-hot path."""
+
+    def _run_embed(self, dtype):
+        model = nn.Embed(num_embeddings=16, features=8, dtype=dtype)
+        inputs = jnp.array([0, 3, 3, 15], dtype=jnp.int32)
+        params = model.init(jax.random.PRNGKey(0), inputs)
+        try:
+            global_config.flax_use_embedding_gather = False
+            expected = model.apply(params, inputs)
+            global_config.flax_use_embedding_gather = True
+            actual = model.apply(params, inputs)
+        finally:
+            global_config.flax_use_embedding_gather = False
+        assert actual.dtype == expected.dtype
+        assert_allclose(actual, expected)
+
+    def test_embed_gather_fp32(self):
+        self._run_embed(jnp.float32)
+
+    def test_embed_gather_fp16(self):
+        # dtype == fp16 exercises the pre-cast embedding_fp16 copy.
+        self._run_embed(jnp.float16)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(LayerNormPatchTest("test_layer_norm_fp32"))
+    suite.addTest(LayerNormPatchTest("test_layer_norm_fp16"))
+    suite.addTest(LayerNormPatchTest("test_layer_norm_bf16"))
+    suite.addTest(LayerNormPatchTest("test_layer_norm_fp64_fallback"))
+    suite.addTest(EmbedPatchTest("test_embed_gather_fp32"))
+    suite.addTest(EmbedPatchTest("test_embed_gather_fp16"))
+    return suite
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner()
+    runner.run(suite())